@@ -8,7 +8,7 @@ from patroni.api import RestApiServer
 from patroni.etcd import Etcd
 from patroni.ha import Ha
 from patroni.postgresql import Postgresql
-from patroni.utils import setup_signal_handlers, reap_children
+from patroni.utils import setup_signal_handlers, sighup_received, reap_children
 from patroni.zookeeper import ZooKeeper
 
 logger = logging.getLogger(__name__)
@@ -16,7 +16,8 @@ logger = logging.getLogger(__name__)
 
 class Patroni:
 
-    def __init__(self, config):
+    def __init__(self, config, config_file=None):
+        self.config_file = config_file
         self.nap_time = config['loop_wait']
         self.postgresql = Postgresql(config['postgresql'])
         self.dcs = self.get_dcs(self.postgresql.name, config)
@@ -33,6 +34,16 @@ class Patroni:
             return ZooKeeper(name, config['zookeeper'])
         raise Exception('Can not find sutable configuration of distributed configuration store')
 
+    def reload_config(self):
+        """Re-read configuration file and apply changes of `loop_wait` and `postgresql` section"""
+        try:
+            with open(self.config_file, 'r') as f:
+                config = yaml.load(f)
+            self.nap_time = config['loop_wait']
+            self.postgresql.reload_config(config['postgresql'])
+        except:
+            logger.exception('Failed to reload configuration from %s', self.config_file)
+
     def schedule_next_run(self):
         self.next_run += self.nap_time
         current_time = time.time()
@@ -47,6 +58,8 @@ class Patroni:
         self.next_run = time.time()
 
         while True:
+            if sighup_received() and self.config_file:
+                self.reload_config()
             logger.info(self.ha.run_cycle())
             reap_children()
             self.schedule_next_run()
@@ -64,7 +77,7 @@ def main():
     with open(sys.argv[1], 'r') as f:
         config = yaml.load(f)
 
-    patroni = Patroni(config)
+    patroni = Patroni(config, sys.argv[1])
     try:
         patroni.run()
     except KeyboardInterrupt:
@@ -75,12 +75,33 @@ class RestApiHandler(BaseHTTPRequestHandler):
 
     def do_GET_patroni(self):
         response = self.get_postgresql_status(True)
+        buffercache = self.server.patroni.postgresql.buffercache
+        progress = buffercache and buffercache.progress
+        if progress:
+            response['prewarm'] = progress
+        removal = self.server.patroni.postgresql.trash.progress
+        if removal:
+            response['data_dir_removal'] = removal
+        callbacks = self.server.patroni.postgresql.callback_stats
+        if callbacks:
+            response['callbacks'] = callbacks
 
         self.send_response(200)
         self.send_header('Content-Type', 'application/json')
         self.end_headers()
         self.wfile.write(json.dumps(response).encode('utf-8'))
 
+    def do_GET_buffercache(self):
+        buffercache = self.server.patroni.postgresql.buffercache
+        content = buffercache and buffercache.read_dump_file()
+        if content:
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/octet-stream')
+            self.end_headers()
+            self.wfile.write(content)
+        else:
+            self.send_error(404)
+
     @check_auth
     def do_POST_restart(self):
         status_code = 503
@@ -156,7 +177,7 @@ class RestApiHandler(BaseHTTPRequestHandler):
                                        pg_xlog_location_diff(pg_last_xlog_receive_location(), '0/0')::bigint,
                                        pg_xlog_location_diff(pg_last_xlog_replay_location(), '0/0')::bigint,
                                        pg_is_in_recovery() AND pg_is_xlog_replay_paused()""", retry=retry)[0]
-            return {
+            result = {
                 'state': self.server.patroni.postgresql.state,
                 'postmaster_start_time': row[0],
                 'role': 'replica' if row[1] else 'master',
@@ -167,6 +188,10 @@ class RestApiHandler(BaseHTTPRequestHandler):
                     'location': row[2]
                 })
             }
+            pending_restart = self.server.patroni.postgresql.pending_restart
+            if pending_restart:
+                result['pending_restart'] = pending_restart
+            return result
         except (psycopg2.Error, RetryFailedError, PostgresConnectionException):
             state = self.server.patroni.postgresql.state
             if state in ['stopped', 'starting', 'stopping', 'restarting', 'running']:
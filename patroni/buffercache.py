@@ -0,0 +1,207 @@
+import itertools
+import logging
+import os
+import psycopg2
+import requests
+import struct
+import time
+
+from requests.exceptions import RequestException
+from six.moves.urllib_parse import urljoin
+from threading import Event, Lock, Thread
+
+logger = logging.getLogger(__name__)
+
+FORK_NAMES = ('main', 'fsm', 'vm', 'init')
+
+
+def compact_blocks(rows):
+    """Merge sorted rows of (database, tablespace, relfilenode, fork, block) into ranges of consecutive blocks
+
+    >>> list(compact_blocks([(1, 0, 2, 0, 5), (1, 0, 2, 0, 6), (1, 0, 2, 0, 8), (1, 0, 3, 0, 9)]))
+    [(1, 0, 2, 0, 5, 2), (1, 0, 2, 0, 8, 1), (1, 0, 3, 0, 9, 1)]
+    """
+    current = None
+    for row in rows:
+        row = tuple(row)
+        if current and current[:4] == row[:4] and current[4] + current[5] == row[4]:
+            current = current[:5] + (current[5] + 1,)
+        else:
+            if current:
+                yield current
+            current = row + (1,)
+    if current:
+        yield current
+
+
+class BufferCache:
+
+    """Keeps the list of hot blocks of shared_buffers on disk and loads them back after start or promote.
+
+    The list is taken from `pg_buffercache` and stored in a compact binary file in the data directory,
+    each record describes a range of consecutive blocks of one relation fork. Replicas additionally keep
+    a copy of the list of the leader, so after promotion they could warm up with the leader's working set.
+    The replay is done with `pg_prewarm` in a background thread and throttled to `rate` blocks per second.
+    Both extensions must be installed in every database."""
+
+    _HEADER = b'PATRONI BUFFERCACHE 1\n'
+    _RECORD = struct.Struct('!IIIBII')  # database, tablespace, relfilenode, fork, first block, number of blocks
+
+    def __init__(self, connect, data_dir, config):
+        """
+        :param connect: function which takes a database name and returns a new autocommit connection
+        :param data_dir: where the lists of blocks are stored
+        :param config: `prewarm` section of the postgresql configuration"""
+
+        self._connect = connect
+        self.dump_file = os.path.join(data_dir, 'patroni.buffercache')
+        self.leader_dump_file = self.dump_file + '.leader'
+        self.interval = config.get('interval', 300)
+        self.rate = config.get('rate', 2000)
+        self.min_usagecount = config.get('min_usagecount', 1)
+        self._next_dump = 0
+        self._dump_thread = None
+        self._prewarm_thread = None
+        self._cancel = Event()
+        self._progress = None
+        self._progress_lock = Lock()
+
+    @property
+    def progress(self):
+        with self._progress_lock:
+            return self._progress and self._progress.copy()
+
+    def _set_progress(self, **kwargs):
+        with self._progress_lock:
+            if self._progress is None or 'state' in kwargs and kwargs['state'] == 'starting':
+                self._progress = {}
+            self._progress.update(kwargs)
+
+    def _write(self, path, content):
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(content)
+        os.rename(tmp, path)
+
+    def read_dump_file(self, path=None):
+        """:returns: content of the file with the list of blocks or `!None` if it doesn't exist"""
+        try:
+            with open(path or self.dump_file, 'rb') as f:
+                content = f.read()
+            if content.startswith(self._HEADER):
+                return content
+            logger.error('Invalid format of %s', path or self.dump_file)
+        except IOError:
+            pass
+        return None
+
+    def _parse(self, content):
+        size = self._RECORD.size
+        return [self._RECORD.unpack_from(content, offset)
+                for offset in range(len(self._HEADER), len(content) - size + 1, size)]
+
+    def _dump(self, leader_api_url):
+        try:
+            conn = self._connect('postgres')
+            try:
+                cur = conn.cursor()
+                cur.execute("""SELECT reldatabase, reltablespace, relfilenode, relforknumber, relblocknumber
+                                 FROM pg_buffercache
+                                WHERE reldatabase IS NOT NULL AND usagecount >= %s
+                             ORDER BY 1, 2, 3, 4, 5""", (self.min_usagecount,))
+                content = self._HEADER + b''.join(self._RECORD.pack(*r) for r in compact_blocks(cur))
+            finally:
+                conn.close()
+            self._write(self.dump_file, content)
+        except:
+            logger.exception('Failed to save the list of blocks in shared_buffers')
+
+        if leader_api_url:
+            url = urljoin(leader_api_url, '/buffercache')
+            try:
+                response = requests.get(url, timeout=5, verify=False)
+                if response.status_code == 200 and response.content.startswith(self._HEADER):
+                    self._write(self.leader_dump_file, response.content)
+            except (IOError, OSError, RequestException):
+                logger.exception('Failed to fetch %s', url)
+
+    def schedule_dump(self, leader_api_url=None):
+        """Save the list of hot blocks in the background once per `interval` seconds.
+
+        :param leader_api_url: REST API url of the leader, its list of blocks is fetched if defined"""
+
+        if self._next_dump <= time.time() and not (self._dump_thread and self._dump_thread.is_alive()):
+            self._next_dump = time.time() + self.interval
+            self._dump_thread = Thread(target=self._dump, args=(leader_api_url,))
+            self._dump_thread.daemon = True
+            self._dump_thread.start()
+
+    def _prewarm(self, path, content):
+        ranges = self._parse(content)
+        total = sum(r[5] for r in ranges)
+        self._set_progress(state='running', file=os.path.basename(path), blocks_total=total, blocks_done=0)
+        done = 0
+        chunk = max(1, int(self.rate / 10))
+        started = time.time()
+        try:
+            conn = self._connect('postgres')
+            try:
+                cur = conn.cursor()
+                cur.execute('SELECT oid, datname FROM pg_database WHERE datallowconn')
+                databases = dict(cur)
+            finally:
+                conn.close()
+
+            for database, group in itertools.groupby(ranges, key=lambda r: r[0]):
+                group = list(group)
+                datname = 'postgres' if database == 0 else databases.get(database)
+                if datname:
+                    conn = self._connect(datname)
+                    try:
+                        cur = conn.cursor()
+                        for _, tablespace, relfilenode, fork, first, count in group:
+                            for block in range(first, first + count, chunk):
+                                if self._cancel.is_set():
+                                    return self._set_progress(state='cancelled')
+                                last = min(block + chunk, first + count) - 1
+                                try:
+                                    cur.execute("""SELECT pg_prewarm(pg_filenode_relation(%s, %s),
+                                                                     %s, 'buffer', %s, %s)""",
+                                                (tablespace, relfilenode, FORK_NAMES[fork], block, last))
+                                except psycopg2.Error:  # relation was dropped or truncated
+                                    pass
+                                done += last - block + 1
+                                self._set_progress(blocks_done=done)
+                                delay = started + done / float(self.rate) - time.time()
+                                if delay > 0:
+                                    self._cancel.wait(delay)
+                    finally:
+                        conn.close()
+                else:
+                    done += sum(r[5] for r in group)
+            self._set_progress(state='finished', blocks_done=done, duration=round(time.time() - started, 3))
+        except:
+            logger.exception('Failed to prewarm shared_buffers')
+            self._set_progress(state='failed')
+
+    def prewarm(self, promoted=False):
+        """Start loading blocks into shared_buffers in the background
+
+        :param promoted: prefer the list of the former leader, if we have it"""
+
+        path = self.leader_dump_file if promoted and os.path.exists(self.leader_dump_file) else self.dump_file
+        content = self.read_dump_file(path)
+        if not content:
+            return False
+        self.cancel()
+        self._cancel.clear()
+        self._set_progress(state='starting')
+        self._prewarm_thread = Thread(target=self._prewarm, args=(path, content))
+        self._prewarm_thread.daemon = True
+        self._prewarm_thread.start()
+        return True
+
+    def cancel(self):
+        if self._prewarm_thread and self._prewarm_thread.is_alive():
+            self._cancel.set()
+            self._prewarm_thread.join()
@@ -0,0 +1,98 @@
+import logging
+import os
+import signal
+import subprocess
+import time
+
+from threading import Condition, Thread
+
+logger = logging.getLogger(__name__)
+
+
+class CallbackExecutor(Thread):
+
+    """Runs callback scripts one after another in the order the events happened.
+
+    A pending callback for some event is superseded by a newer one for the same event, i.e. if postgres
+    changed the role twice while the previous callback was still running, only the latest role is reported.
+    Every callback gets `timeout` seconds to finish, after that its whole process group is killed."""
+
+    def __init__(self, timeout=60):
+        super(CallbackExecutor, self).__init__()
+        self.daemon = True
+        self.timeout = timeout
+        self._queue = []
+        self._condition = Condition()
+        self._stats = {}
+
+    def call(self, cmd):
+        """Enqueue execution of the callback
+
+        :param cmd: list of arguments, the first one is the script, the second one the name of the event"""
+
+        with self._condition:
+            superseded = [c for c in self._queue if c[1] == cmd[1]]
+            for c in superseded:
+                self._queue.remove(c)
+                logger.info('Skipping callback %s because it is superseded', ' '.join(c))
+            self._queue.append(cmd)
+            self._condition.notify()
+            if not self.is_alive():
+                self.start()
+
+    @property
+    def stats(self):
+        """:returns: number of queued callbacks and per event number of calls, timeouts,
+                     duration and exit status of the last call"""
+        with self._condition:
+            return {'queued': len(self._queue),
+                    'events': dict((name, stats.copy()) for name, stats in self._stats.items())}
+
+    def _update_stats(self, name, **kwargs):
+        with self._condition:
+            stats = self._stats.setdefault(name, {'calls': 0, 'timeouts': 0})
+            stats['calls'] += 1
+            if kwargs.pop('timed_out', False):
+                stats['timeouts'] += 1
+            stats.update(kwargs)
+
+    def execute(self, cmd):
+        """Run the callback and wait at most `timeout` seconds for it to finish
+
+        :returns: exit status of the callback, negative signal number if it was killed
+                  or `!None` if it could not be started"""
+
+        started = time.time()
+        timed_out = False
+        try:
+            process = subprocess.Popen(cmd, close_fds=True, preexec_fn=os.setsid)
+            while process.poll() is None:
+                if time.time() - started > self.timeout:
+                    logger.warning('Killing callback %s because it runs longer than %s seconds',
+                                   ' '.join(cmd), self.timeout)
+                    timed_out = True
+                    try:
+                        os.killpg(process.pid, signal.SIGKILL)
+                    except OSError:  # process group is already gone
+                        pass
+                    process.wait()
+                    break
+                time.sleep(0.1)
+            returncode = process.returncode
+        except:
+            logger.exception('callback %s failed', ' '.join(cmd))
+            returncode = None
+        self._update_stats(cmd[1], last_returncode=returncode, timed_out=timed_out,
+                           last_duration=round(time.time() - started, 3))
+        return returncode
+
+    def run(self):
+        while True:
+            with self._condition:
+                while not self._queue:
+                    self._condition.wait()
+                cmd = self._queue.pop(0)
+            try:
+                self.execute(cmd)
+            except:
+                logger.exception('Exception during execution of callback %s', ' '.join(cmd))
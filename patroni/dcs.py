@@ -89,7 +89,49 @@ class Failover(namedtuple('Failover', 'index,leader,member')):
         return Failover(index, t[0], t[1]) if t[0] or t[1] else None
 
 
-class Cluster(namedtuple('Cluster', 'initialize,leader,last_leader_operation,members,failover')):
+class SyncState(namedtuple('SyncState', 'index,leader,sync_standby')):
+
+    """Immutable object (namedtuple) which represents last observed synchronous replication state.
+    Consists of the following fields:
+    :param index: modification index of a `/sync` key in a Configuration Store
+    :param leader: name of the leader which has configured synchronous replication
+    :param sync_standby: name of the standby which is known to be replicating synchronously from that leader"""
+
+    @staticmethod
+    def from_node(index, value):
+        """
+        >>> SyncState.from_node(1, '{"leader": "foo", "sync_standby": "bar"}').sync_standby == 'bar'
+        True
+        >>> SyncState.from_node(1, '{').leader is None
+        True
+        """
+        try:
+            data = json.loads(value)
+            if not isinstance(data, dict):
+                data = {}
+        except:
+            data = {}
+        return SyncState(index, data.get('leader'), data.get('sync_standby'))
+
+    @staticmethod
+    def empty():
+        return SyncState(None, None, None)
+
+    def matches(self, name):
+        """Checks whether the node with a given name is allowed to become a new leader.
+        When the synchronous replication was not configured yet every node is allowed.
+
+        >>> SyncState(1, 'foo', 'bar').matches('bar')
+        True
+        >>> SyncState(1, 'foo', None).matches('bar')
+        False
+        >>> SyncState.empty().matches('bar')
+        True
+        """
+        return not self.leader or name in (self.leader, self.sync_standby)
+
+
+class Cluster(namedtuple('Cluster', 'initialize,leader,last_leader_operation,members,failover,sync')):
 
     """Immutable object (namedtuple) which represents PostgreSQL cluster.
     Consists of the following fields:
@@ -98,7 +140,8 @@ class Cluster(namedtuple('Cluster', 'initialize,leader,last_leader_operation,mem
     :param last_leader_operation: int or long object containing position of last known leader operation.
         This value is stored in `/optime/leader` key
     :param members: list of Member object, all PostgreSQL cluster members including leader
-    :param failover: reference to `Failover` object"""
+    :param failover: reference to `Failover` object
+    :param sync: reference to `SyncState` object, last observed synchronous replication state"""
 
     def is_unlocked(self):
         return not (self.leader and self.leader.name)
@@ -111,6 +154,7 @@ class AbstractDCS:
     _INITIALIZE = 'initialize'
     _LEADER = 'leader'
     _FAILOVER = 'failover'
+    _SYNC = 'sync'
     _MEMBERS = 'members/'
     _OPTIME = 'optime'
     _LEADER_OPTIME = _OPTIME + '/' + _LEADER
@@ -152,6 +196,10 @@ class AbstractDCS:
     def failover_path(self):
         return self.client_path(self._FAILOVER)
 
+    @property
+    def sync_path(self):
+        return self.client_path(self._SYNC)
+
     @property
     def leader_optime_path(self):
         return self.client_path(self._LEADER_OPTIME)
@@ -215,6 +263,24 @@ class AbstractDCS:
     def manual_failover(self, leader, member, index=None):
         return self.set_failover_value(leader + (':' + member if member else ''), index)
 
+    @abc.abstractmethod
+    def set_sync_state_value(self, value, index=None):
+        """Create or update `/sync` key"""
+
+    @abc.abstractmethod
+    def delete_sync_state(self, index=None):
+        """Remove `/sync` key
+
+        :param index: if defined the key should be removed only if its modification index matches"""
+
+    def write_sync_state(self, leader, sync_standby, index=None):
+        """Write the new synchronous replication state into `/sync` key
+
+        :returns: `!True` on success. `!False` means that key was updated by someone else (index does not match)"""
+
+        value = json.dumps({'leader': leader, 'sync_standby': sync_standby}, separators=(',', ':'))
+        return self.set_sync_state_value(value, index)
+
     def current_leader(self):
         try:
             cluster = self.get_cluster()
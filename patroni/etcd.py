@@ -10,7 +10,7 @@ import urllib3
 
 from dns.exception import DNSException
 from dns import resolver
-from patroni.dcs import AbstractDCS, Cluster, Failover, Leader, Member
+from patroni.dcs import AbstractDCS, Cluster, Failover, Leader, Member, SyncState
 from patroni.exceptions import DCSError
 from patroni.utils import Retry, RetryFailedError, sleep
 from requests.exceptions import RequestException
@@ -198,9 +198,13 @@ class Etcd(AbstractDCS):
             if failover:
                 failover = Failover.from_node(failover.modifiedIndex, failover.value)
 
-            self._cluster = Cluster(initialize, leader, last_leader_operation, members, failover)
+            # get synchronization state
+            sync = nodes.get(self._SYNC, None)
+            sync = SyncState.empty() if sync is None else SyncState.from_node(sync.modifiedIndex, sync.value)
+
+            self._cluster = Cluster(initialize, leader, last_leader_operation, members, failover, sync)
         except etcd.EtcdKeyNotFound:
-            self._cluster = Cluster(False, None, None, [], None)
+            self._cluster = Cluster(False, None, None, [], None, SyncState.empty())
         except:
             logger.exception('get_cluster')
             raise EtcdError('Etcd is not responding properly')
@@ -226,6 +230,14 @@ class Etcd(AbstractDCS):
     def set_failover_value(self, value, index=None):
         return self.client.write(self.failover_path, value, prevIndex=index or 0)
 
+    @catch_etcd_errors
+    def set_sync_state_value(self, value, index=None):
+        return self.retry(self.client.write, self.sync_path, value, prevIndex=index or 0)
+
+    @catch_etcd_errors
+    def delete_sync_state(self, index=None):
+        return self.retry(self.client.delete, self.sync_path, prevIndex=index or 0)
+
     @catch_etcd_errors
     def write_leader_optime(self, last_operation):
         return self.client.set(self.leader_optime_path, last_operation)
@@ -40,6 +40,57 @@ class Ha:
                 pass
         return ret
 
+    def is_synchronous_mode(self):
+        return bool(self.state_handler.synchronous_mode)
+
+    def process_sync_replication(self):
+        """Manage synchronous replication on the leader.
+
+        Synchronous standby is registered in two places: in `synchronous_standby_names` of the leader and in DCS.
+        The invariant is that if the `sync_standby` is set in DCS, the leader must have it configured as a
+        synchronous standby. Therefore when assigning a new standby we first change the postgres configuration
+        and publish it in DCS only after postgres reports it as synchronous. When removing, we first remove it
+        from DCS and only after that from the postgres configuration. This way we consider for promotion only
+        standbys which were guaranteed to replicate synchronously."""
+
+        if not self.state_handler.is_leader():
+            return  # promotion is not finished yet, postgres is still in recovery
+
+        if self.is_synchronous_mode():
+            if self.state_handler.server_version < 90400:
+                return logger.error('synchronous_mode requires PostgreSQL 9.4 or newer')
+
+            sync = self.cluster.sync
+            if sync.leader and sync.leader != self.state_handler.name:
+                # The key still belongs to the former leader, the write right after acquiring the lock has failed
+                if self.dcs.write_sync_state(self.state_handler.name, None, index=sync.index):
+                    logger.info('Took over the synchronous replication key from %s', sync.leader)
+                else:
+                    logger.warning('Failed to take over the synchronous replication key from %s', sync.leader)
+                return
+
+            current = sync.sync_standby if sync.leader == self.state_handler.name else None
+            picked, is_sync = self.state_handler.pick_synchronous_standby(self.cluster)
+            if picked != current:
+                if current:
+                    logger.info('Removing synchronous privilege from %s', current)
+                    if not self.dcs.write_sync_state(self.state_handler.name, None, index=sync.index):
+                        logger.info('Synchronous replication key updated by someone else')
+                        return
+                logger.info('Assigning synchronous standby status to %s', picked)
+                self.state_handler.set_synchronous_standby(picked)
+                # The sync state in DCS is updated only when postgres confirms that the standby is synchronous,
+                # otherwise it will be done on one of the next cycles.
+                if picked and is_sync and not current:
+                    if self.dcs.write_sync_state(self.state_handler.name, picked, index=sync.index):
+                        logger.info('Synchronous standby status assigned to %s', picked)
+                    else:
+                        logger.info('Synchronous replication key updated by someone else')
+        elif self.cluster.sync.leader:
+            if self.dcs.delete_sync_state(index=self.cluster.sync.index):
+                logger.info('Disabled synchronous replication')
+                self.state_handler.set_synchronous_standby(None)
+
     def has_lock(self):
         lock_owner = self.cluster.leader and self.cluster.leader.name
         logger.info('Lock owner: %s; I am %s', lock_owner, self.state_handler.name)
@@ -231,6 +282,10 @@ class Ha:
         return self._is_healthiest_node(members, check_replication_lag=False)
 
     def is_healthiest_node(self):
+        if self.is_synchronous_mode() and not self.cluster.sync.matches(self.state_handler.name):
+            logger.info('Not promoting self because i am not the synchronous standby')
+            return False
+
         if self.cluster.failover:
             return self.manual_failover_process_no_leader()
 
@@ -250,6 +305,8 @@ class Ha:
         if not failover.leader or failover.leader == self.state_handler.name:
             if not failover.member or failover.member != self.state_handler.name:
                 members = [m for m in self.cluster.members if not failover.member or m.name == failover.member]
+                if self.is_synchronous_mode():  # only the synchronous standby is allowed to become a new leader
+                    members = [m for m in members if self.cluster.sync.matches(m.name)]
                 if self.is_failover_possible(members):  # check that there are healthy members
                     self._async_executor.schedule('manual failover: demote')
                     self._async_executor.run_async(self.demote)
@@ -271,6 +328,11 @@ class Ha:
                 if self.cluster.failover:
                     logger.info('Cleanning up failover key after acquiring leader lock...')
                     self.dcs.manual_failover('', '')
+                if self.is_synchronous_mode():
+                    # Make ourselves the authoritative source of truth for the synchronous replication state.
+                    # The new synchronous standby will be picked on the next cycles when replicas connect to us.
+                    if not self.dcs.write_sync_state(self.state_handler.name, None, index=self.cluster.sync.index):
+                        logger.warning('Failed to update the synchronous replication key, will retry later')
                 return self.enforce_master_role('acquired session lock as a leader',
                                                 'promoted self to leader by acquiring session lock')
             else:
@@ -288,8 +350,10 @@ class Ha:
                     return msg
 
             if self.update_lock():
-                return self.enforce_master_role('no action.  i am the leader with the lock',
-                                                'promoted self to leader because i had the session lock')
+                ret = self.enforce_master_role('no action.  i am the leader with the lock',
+                                               'promoted self to leader because i had the session lock')
+                self.process_sync_replication()
+                return ret
             else:
                 # Either there is no connection to DCS or someone else acquired the lock
                 logger.error('failed to update leader lock')
@@ -350,6 +414,14 @@ class Ha:
         else:
             return self._async_executor.scheduled_action + ' in progress'
 
+    def dump_buffercache(self):
+        """Periodically save the list of hot blocks, replicas also fetch the list of the leader"""
+        buffercache = self.state_handler.buffercache
+        if buffercache and self.state_handler.state == 'running' and self.state_handler.is_running():
+            leader = self.cluster.leader
+            leader_api_url = leader and leader.name != self.state_handler.name and leader.member.api_url
+            buffercache.schedule_dump(leader_api_url or None)
+
     def _run_cycle(self):
         try:
             self.load_cluster_from_dcs()
@@ -388,6 +460,7 @@ class Ha:
                     return self.process_healthy_cluster()
             finally:
                 self.state_handler.sync_replication_slots(self.cluster)
+                self.dump_buffercache()
         except DCSError:
             logger.error('Error communicating with DCS')
             if self.state_handler.is_running() and self.state_handler.is_leader():
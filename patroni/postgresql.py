@@ -6,7 +6,10 @@ import shutil
 import subprocess
 import time
 
+from patroni.buffercache import BufferCache
+from patroni.callback_executor import CallbackExecutor
 from patroni.exceptions import PostgresConnectionException, PostgresException
+from patroni.trash import Trash
 from patroni.utils import Retry, RetryFailedError
 from six.moves.urllib_parse import urlparse
 from threading import Lock
@@ -50,12 +53,15 @@ class Postgresql:
         self.admin = config['admin']
         self.pg_rewind = config.get('pg_rewind', {})
         self.callback = config.get('callbacks', {})
+        self._callback_executor = CallbackExecutor(config.get('callback_timeout', 60))
         self.use_slots = config.get('use_slots', True)
+        self.synchronous_mode = config.get('synchronous_mode', False)
         self.schedule_load_slots = self.use_slots
         self.recovery_conf = os.path.join(self.data_dir, 'recovery.conf')
         self.configuration_to_save = (os.path.join(self.data_dir, 'pg_hba.conf'),
                                       os.path.join(self.data_dir, 'postgresql.conf'))
         self.postmaster_pid = os.path.join(self.data_dir, 'postmaster.pid')
+        self.config_file = os.path.abspath(os.path.join(self.data_dir, 'patroni.conf'))
         self.trigger_file = config.get('recovery_conf', {}).get('trigger_file', None) or 'promote'
         self.trigger_file = os.path.abspath(os.path.join(self.data_dir, self.trigger_file))
 
@@ -70,6 +76,12 @@ class Postgresql:
         self._cursor_holder = None
         self._need_rewind = False
         self.replication_slots = []  # list of already existing replication slots
+        self._pending_restart = set()  # parameters which were changed but require restart to be applied
+        self._running_parameters = dict(config['parameters'])  # parameters postgres was started with
+        self.buffercache = BufferCache(self.local_connection, self.data_dir, config['prewarm'])\
+            if config.get('prewarm') else None
+        self.trash = Trash(config.get('data_dir_removal_rate', 64) * 1024 * 1024)
+        self.trash.schedule_leftovers(self.data_dir)
         self.retry = Retry(max_tries=-1, deadline=5, max_delay=1, retry_exceptions=PostgresConnectionException)
 
         self._state = 'stopped'
@@ -125,6 +137,18 @@ class Postgresql:
             self._connection.autocommit = True
         return self._connection
 
+    def local_connection(self, database='postgres'):
+        """:returns: new autocommit connection to the given database without statement_timeout"""
+        r = parseurl('postgres://{0}/{1}'.format(self.local_address, database))
+        r['options'] = '-c statement_timeout=0'
+        conn = psycopg2.connect(**r)
+        conn.autocommit = True
+        return conn
+
+    @property
+    def server_version(self):
+        return self.connection().server_version
+
     def _cursor(self):
         if not self._cursor_holder or self._cursor_holder.closed or self._cursor_holder.connection.closed != 0:
             self._cursor_holder = self.connection().cursor()
@@ -204,17 +228,21 @@ class Postgresql:
         return subprocess.call(' '.join(self._pg_ctl) + ' status > /dev/null 2>&1', shell=True) == 0
 
     def call_nowait(self, cb_name):
-        """ pick a callback command and call it without waiting for it to finish """
+        """ pick a callback command and enqueue it without waiting for it to finish """
         if not self.callback or cb_name not in self.callback:
             return False
         cmd = self.callback[cb_name]
         try:
-            subprocess.Popen(shlex.split(cmd) + [cb_name, self.role, self.scope])
+            self._callback_executor.call(shlex.split(cmd) + [cb_name, self.role, self.scope])
         except:
             logger.exception('callback %s %s %s %s failed', cmd, cb_name, self.role, self.scope)
             return False
         return True
 
+    @property
+    def callback_stats(self):
+        return self._callback_executor.stats
+
     @property
     def role(self):
         with self._role_lock:
@@ -246,9 +274,14 @@ class Postgresql:
         if not block_callbacks:
             self.set_state('starting')
 
+        self.write_postgresql_conf()
         ret = subprocess.call(self._pg_ctl + ['start', '-o', self.server_options()]) == 0
 
         self.set_state('running' if ret else 'start failed')
+        if ret:
+            self._running_parameters = dict(self.config['parameters'])
+            self._pending_restart.clear()
+            self.buffercache and self.buffercache.prewarm()
 
         self.schedule_load_slots = ret and self.use_slots
         self.save_configuration_files()
@@ -274,6 +307,7 @@ class Postgresql:
                 self.set_state('stopped')
             return True
 
+        self.buffercache and self.buffercache.cancel()
         if block_callbacks:
             self.checkpoint()
         else:
@@ -304,10 +338,77 @@ class Postgresql:
         return ret
 
     def server_options(self):
-        options = "--listen_addresses='{}' --port={}".format(self.listen_addresses, self.port)
-        for setting, value in self.config['parameters'].items():
-            options += " --{}='{}'".format(setting, value)
-        return options
+        return "--listen_addresses='{}' --port={} --config_file='{}'".format(
+            self.listen_addresses, self.port, self.config_file)
+
+    def write_postgresql_conf(self):
+        """Write `parameters` from the configuration into the file which is used as `config_file` by postgres.
+        It includes the original postgresql.conf first, so values from the configuration take precedence."""
+
+        with open(self.config_file, 'w') as f:
+            f.write('# Do not edit this file manually!\n# It will be overwritten by Patroni!\n')
+            f.write("include 'postgresql.conf'\n\n")
+            for name, value in sorted(self.config['parameters'].items()):
+                # in synchronous mode synchronous_standby_names is managed by patroni and must not be overridden
+                if not (self.synchronous_mode and name == 'synchronous_standby_names'):
+                    value = str(value).replace('\\', '\\\\').replace("'", "''")
+                    f.write("{0} = '{1}'\n".format(name, value))
+
+    @property
+    def pending_restart(self):
+        """list of parameters which were changed in the configuration but need a restart to be applied"""
+        return sorted(self._pending_restart)
+
+    def reload_config(self, config):
+        """Apply new configuration without restarting postgres when it is possible.
+
+        Changed parameters are classified with the `pg_settings.context` value: all changes are applied with
+        `reload()`, but parameters with `postmaster` context which differ from the values postgres was started
+        with are reported via `pending_restart` until the next restart. Settings of Patroni itself (callbacks,
+        pg_rewind, use_slots, prewarm, recovery_conf, synchronous_mode, data_dir_removal_rate) are applied
+        immediately."""
+
+        old_parameters = self.config['parameters']
+        parameters = config['parameters']
+        changes = set(name for name, value in parameters.items()
+                      if name not in old_parameters or str(old_parameters[name]) != str(value))
+        changes.update(name for name in old_parameters if name not in parameters)
+
+        if config.get('prewarm') != self.config.get('prewarm'):
+            self.buffercache and self.buffercache.cancel()
+            self.buffercache = BufferCache(self.local_connection, self.data_dir, config['prewarm'])\
+                if config.get('prewarm') else None
+
+        self.config = config
+        self.callback = config.get('callbacks', {})
+        self._callback_executor.timeout = config.get('callback_timeout', 60)
+        self.synchronous_mode = config.get('synchronous_mode', False)
+        self.pg_rewind = config.get('pg_rewind', {})
+        self.trash.rate = config.get('data_dir_removal_rate', 64) * 1024 * 1024
+        if self.use_slots != config.get('use_slots', True):
+            self.use_slots = self.schedule_load_slots = config.get('use_slots', True)
+        trigger_file = config.get('recovery_conf', {}).get('trigger_file', None) or 'promote'
+        self.trigger_file = os.path.abspath(os.path.join(self.data_dir, trigger_file))
+
+        if changes:
+            self.write_postgresql_conf()
+            if self.is_running():
+                # changed compared to the values postgres is running with, they could differ from `changes`
+                not_applied = set(name for name, value in parameters.items() if name not in self._running_parameters
+                                  or str(self._running_parameters[name]) != str(value))
+                not_applied.update(name for name in self._running_parameters if name not in parameters)
+
+                contexts = dict(self.query('SELECT name, context FROM pg_settings WHERE name = ANY(%s)',
+                                           sorted(changes | not_applied)))
+                for name in sorted(changes):
+                    if name not in contexts:
+                        logger.warning('Unknown parameter %s', name)
+                    elif contexts[name] == 'internal':
+                        logger.warning('Parameter %s can not be changed', name)
+                self._pending_restart = set(n for n in not_applied if contexts.get(n) == 'postmaster')
+                self._pending_restart and logger.info('Changing %s requires restart', ', '.join(self.pending_restart))
+                self.reload()
+        logger.info('Configuration reloaded, changed parameters: %s', ', '.join(sorted(changes)) or 'none')
 
     def is_healthy(self):
         if not self.is_running():
@@ -327,10 +428,11 @@ class Postgresql:
                     continue
                 f.write(line + '\n')
 
-    @staticmethod
-    def primary_conninfo(leader_url):
+    def primary_conninfo(self, leader_url):
         r = parseurl(leader_url)
-        return 'user={user} password={password} host={host} port={port} sslmode=prefer sslcompression=1'.format(**r)
+        r['application_name'] = self.name
+        return ('user={user} password={password} host={host} port={port} '
+                'sslmode=prefer sslcompression=1 application_name={application_name}').format(**r)
 
     def check_recovery_conf(self, leader):
         if not os.path.isfile(self.recovery_conf):
@@ -495,6 +597,7 @@ recovery_target_timeline = 'latest'
             self.set_role('master')
             logger.info("cleared rewind flag after becoming the leader")
             self._need_rewind = False
+            self.buffercache and self.buffercache.prewarm(promoted=True)
             self.call_nowait(ACTION_ON_ROLE_CHANGE)
         return ret
 
@@ -550,6 +653,43 @@ recovery_target_timeline = 'latest'
             except:
                 logger.exception('Exception when changing replication slots')
 
+    def pick_synchronous_standby(self, cluster):
+        """Finds the best candidate to be the synchronous standby.
+
+        Current synchronous standby is always preferred, unless it has disconnected or is not a member of
+        the cluster any longer. Other candidates are ordered by their replay lag in bytes, which is used as
+        an approximation of the commit latency because pg_stat_replication doesn't expose timings.
+
+        :returns: tuple of candidate name or `!None`, and `!True` if the candidate is already the active
+            synchronous standby according to `pg_stat_replication`."""
+
+        current = cluster.sync.sync_standby
+        members = set(m.name for m in cluster.members if m.name != self.name)
+        candidates = []
+        for app_name, state, sync_state in self.query(
+                """SELECT application_name, state, sync_state
+                     FROM pg_stat_replication
+                 ORDER BY pg_xlog_location_diff(pg_current_xlog_location(), replay_location) NULLS LAST,
+                          application_name"""):
+            if state != 'streaming' or app_name not in members:
+                continue
+            if sync_state == 'sync':
+                return app_name, True
+            if sync_state == 'potential' and app_name == current:
+                # Prefer current even if it is not the fastest one any more to avoid spurious swaps
+                return current, False
+            if sync_state == 'async':
+                candidates.append(app_name)
+        return (candidates[0] if candidates else None), False
+
+    def set_synchronous_standby(self, name):
+        """Sets a node to be the synchronous standby and reloads configuration if the value has changed"""
+
+        value = '"{0}"'.format(name) if name else ''
+        if self.query("SELECT current_setting('synchronous_standby_names')").fetchone()[0] != value:
+            self.query('ALTER SYSTEM SET synchronous_standby_names = %s', value)
+            self.query('SELECT pg_reload_conf()')
+
     def last_operation(self):
         return str(self.xlog_position())
 
@@ -596,7 +736,8 @@ recovery_target_timeline = 'latest'
             elif os.path.isfile(self.data_dir):
                 os.remove(self.data_dir)
             elif os.path.isdir(self.data_dir):
-                shutil.rmtree(self.data_dir)
+                # rename is atomic and fast, the new clone could be started immediately
+                self.trash.move(self.data_dir) or shutil.rmtree(self.data_dir)
         except:
             logger.exception('Could not remove data directory %s', self.data_dir)
             self.move_data_directory()
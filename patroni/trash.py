@@ -0,0 +1,128 @@
+import logging
+import os
+import shutil
+import time
+
+from threading import Condition, Thread
+
+logger = logging.getLogger(__name__)
+
+TRASH_SUFFIX = '.patroni-trash-'
+
+
+class Trash(Thread):
+
+    """Removes directories in the background without saturating disk I/O.
+
+    A directory is first renamed into a sibling trash path, which is atomic on the same filesystem, so a new
+    directory could be created at the old place immediately. The worker thread then deletes the trash file by
+    file. Big files are truncated in steps of `CHUNK` bytes before they are unlinked, because freeing of the
+    extents of a huge file at once causes an I/O spike. The removal rate is limited to `rate` bytes per second."""
+
+    CHUNK = 64 * 1024 * 1024
+
+    def __init__(self, rate=0):
+        """:param rate: maximum number of bytes removed per second, 0 means unlimited"""
+        super(Trash, self).__init__()
+        self.daemon = True
+        self.rate = rate
+        self._queue = []
+        self._condition = Condition()
+        self._progress = None
+
+    @property
+    def progress(self):
+        with self._condition:
+            return self._progress and dict(self._progress, queued=len(self._queue))
+
+    def _set_progress(self, **kwargs):
+        with self._condition:
+            self._progress.update(kwargs)
+
+    def move(self, path):
+        """Rename the directory to the trash path and schedule its removal
+
+        :returns: `!True` if the directory was moved"""
+
+        now = time.time()
+        trash = '{0}{1}{2}.{3:03d}'.format(os.path.normpath(path), TRASH_SUFFIX,
+                                          time.strftime('%Y-%m-%d-%H-%M-%S', time.localtime(now)), int(now * 1000) % 1000)
+        try:
+            os.rename(path, trash)
+        except OSError:
+            logger.exception('Could not move %s to %s', path, trash)
+            return False
+        logger.info('Moved %s to %s, it will be removed in the background', path, trash)
+        self.schedule(trash)
+        return True
+
+    def schedule(self, path):
+        with self._condition:
+            if path not in self._queue:
+                self._queue.append(path)
+            self._condition.notify()
+            if not self.is_alive():
+                self.start()
+
+    def schedule_leftovers(self, path):
+        """Schedule removal of trash of the `path` which was left from the previous run"""
+        parent, base = os.path.split(os.path.normpath(path))
+        try:
+            names = sorted(os.listdir(parent or '.'))
+        except OSError:
+            return
+        for name in names:
+            if name.startswith(base + TRASH_SUFFIX) and os.path.isdir(os.path.join(parent, name)):
+                self.schedule(os.path.join(parent, name))
+
+    def _throttle(self, started, removed):
+        if self.rate > 0:
+            delay = started + removed / float(self.rate) - time.time()
+            if delay > 0:
+                time.sleep(delay)
+
+    def remove(self, path):
+        started = time.time()
+        files = removed = 0
+        total = sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path)
+                    for name in names if not os.path.islink(os.path.join(root, name)))
+        with self._condition:
+            self._progress = {'path': path, 'state': 'running', 'bytes_total': total, 'bytes_removed': 0,
+                              'files_removed': 0}
+        for root, dirs, names in os.walk(path, topdown=False):
+            for name in names:
+                name = os.path.join(root, name)
+                if not os.path.islink(name):
+                    size = os.path.getsize(name)
+                    while size > self.CHUNK:
+                        size -= self.CHUNK
+                        with open(name, 'r+b') as f:
+                            f.truncate(size)
+                        removed += self.CHUNK
+                        self._throttle(started, removed)
+                    removed += size
+                os.unlink(name)
+                files += 1
+                self._set_progress(bytes_removed=removed, files_removed=files)
+                self._throttle(started, removed)
+            for name in dirs:
+                name = os.path.join(root, name)
+                os.unlink(name) if os.path.islink(name) else os.rmdir(name)
+        os.rmdir(path)
+        self._set_progress(state='finished', duration=round(time.time() - started, 3))
+        logger.info('Removed %s', path)
+
+    def run(self):
+        while True:
+            with self._condition:
+                while not self._queue:
+                    self._condition.wait()
+                path = self._queue[0]
+            try:
+                self.remove(path)
+            except:
+                logger.exception('Failed to remove %s, removing it without throttling', path)
+                self._progress and self._set_progress(state='failed')
+                shutil.rmtree(path, ignore_errors=True)
+            with self._condition:
+                self._queue.pop(0)
@@ -11,6 +11,7 @@ from patroni.exceptions import PatroniException
 ignore_sigterm = False
 interrupted_sleep = False
 reap_children = False
+received_sighup = False
 
 _DATE_TIME_RE = re.compile(r'''^
 (?P<year>\d{4})\-(?P<month>\d{2})\-(?P<day>\d{2})  # date
@@ -60,6 +61,18 @@ def sigchld_handler(signo, stack_frame):
     reap_children = interrupted_sleep = True
 
 
+def sighup_handler(signo, stack_frame):
+    global received_sighup
+    received_sighup = True
+
+
+def sighup_received():
+    """:returns: `!True` if SIGHUP was received since the last call"""
+    global received_sighup
+    ret, received_sighup = received_sighup, False
+    return ret
+
+
 def sleep(interval):
     global interrupted_sleep
     current_time = time.time()
@@ -76,6 +89,7 @@ def sleep(interval):
 def setup_signal_handlers():
     signal.signal(signal.SIGTERM, sigterm_handler)
     signal.signal(signal.SIGCHLD, sigchld_handler)
+    signal.signal(signal.SIGHUP, sighup_handler)
 
 
 def reap_children():
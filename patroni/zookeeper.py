@@ -5,7 +5,7 @@ import time
 
 from kazoo.client import KazooClient, KazooState
 from kazoo.exceptions import NoNodeError, NodeExistsError
-from patroni.dcs import AbstractDCS, Cluster, Failover, Leader, Member
+from patroni.dcs import AbstractDCS, Cluster, Failover, Leader, Member, SyncState
 from patroni.exceptions import DCSError
 from patroni.utils import sleep
 from requests.exceptions import RequestException
@@ -164,10 +164,14 @@ class ZooKeeper(AbstractDCS):
         if failover:
             failover = Failover.from_node(failover[1].version, failover[0])
 
+        # get synchronization state
+        sync = self.get_node(self.sync_path, watch=self.cluster_watcher) if self._SYNC in nodes else None
+        sync = SyncState.empty() if sync is None else SyncState.from_node(sync[1].version, sync[0])
+
         # get last leader operation
         optime = self.get_node(self.leader_optime_path) if self._OPTIME in nodes and self.fetch_cluster else None
         self.last_leader_operation = 0 if optime is None else int(optime[0])
-        self._cluster = Cluster(initialize, leader, self.last_leader_operation, members, failover)
+        self._cluster = Cluster(initialize, leader, self.last_leader_operation, members, failover, sync)
 
     def _load_cluster(self):
         if self.exhibitor and self.exhibitor.poll():
@@ -203,6 +207,26 @@ class ZooKeeper(AbstractDCS):
             logging.exception('set_failover_value')
             return False
 
+    def set_sync_state_value(self, value, index=None):
+        try:
+            self.client.retry(self.client.set, self.sync_path, value.encode('utf-8'), version=index or -1)
+            return True
+        except NoNodeError:
+            return not index and self._create(self.sync_path, value, makepath=True)
+        except:
+            logger.exception('set_sync_state_value')
+            return False
+
+    def delete_sync_state(self, index=None):
+        try:
+            self.client.retry(self.client.delete, self.sync_path, version=index or -1)
+        except NoNodeError:
+            pass
+        except:
+            logger.exception('delete_sync_state')
+            return False
+        return True
+
     def initialize(self):
         return self._create(self.initialize_path, self._name, makepath=True)
 
@@ -13,6 +13,13 @@ class MockPostgresql(Mock):
     name = 'test'
     state = 'running'
     role = 'master'
+    pending_restart = ['shared_buffers']
+    callback_stats = {'queued': 0, 'events': {'on_start': {'calls': 1, 'timeouts': 0, 'last_returncode': 0}}}
+    trash = Mock()
+    trash.progress = {'path': 'data.patroni-trash-1', 'state': 'running', 'bytes_removed': 1}
+    buffercache = Mock()
+    buffercache.progress = {'state': 'running', 'blocks_total': 2, 'blocks_done': 1}
+    buffercache.read_dump_file.return_value = b'PATRONI BUFFERCACHE 1\n'
 
     def connection(self):
         return psycopg2_connect()
@@ -89,6 +96,11 @@ class TestRestApiHandler(unittest.TestCase):
     def test_do_GET_patroni(self):
         MockRestApiServer(RestApiHandler, b'GET /patroni')
 
+    def test_do_GET_buffercache(self):
+        MockRestApiServer(RestApiHandler, b'GET /buffercache')
+        with patch.object(MockPostgresql, 'buffercache', None):
+            MockRestApiServer(RestApiHandler, b'GET /buffercache')
+
     def test_basicauth(self):
         MockRestApiServer(RestApiHandler, b'POST /restart HTTP/1.0')
         MockRestApiServer(RestApiHandler, b'POST /restart HTTP/1.0\nAuthorization:')
@@ -0,0 +1,101 @@
+import os
+import psycopg2
+import shutil
+import unittest
+
+from mock import Mock, patch
+from patroni.buffercache import BufferCache
+from requests.exceptions import RequestException
+
+
+class MockCursor(object):
+
+    def __init__(self):
+        self.results = []
+
+    def execute(self, sql, *params):
+        if sql.startswith('SELECT reldatabase'):
+            self.results = [(0, 1664, 1260, 0, 0), (1, 1663, 16384, 0, 0), (1, 1663, 16384, 0, 1),
+                            (1, 1663, 16384, 0, 2), (1, 1663, 16385, 1, 0), (2, 1663, 16386, 0, 0)]
+        elif sql.startswith('SELECT oid, datname'):
+            self.results = [(1, 'postgres')]
+        elif params[0][1] == 16385:
+            raise psycopg2.Error()
+        else:
+            self.results = [(None,)]
+
+    def __iter__(self):
+        for i in self.results:
+            yield i
+
+
+class MockConnection(object):
+
+    def cursor(self):
+        return MockCursor()
+
+    def close(self):
+        pass
+
+
+def requests_get(url, **kwargs):
+    response = Mock()
+    response.status_code = 200
+    response.content = b'PATRONI BUFFERCACHE 1\n'
+    return response
+
+
+class TestBufferCache(unittest.TestCase):
+
+    def setUp(self):
+        self.data_dir = 'data/test_buffercache'
+        os.path.exists(self.data_dir) or os.makedirs(self.data_dir)
+        self.b = BufferCache(lambda database: MockConnection(), self.data_dir, {'rate': 1000000})
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    @patch('requests.get', requests_get)
+    def test_dump(self):
+        self.b._dump(None)
+        self.assertEquals(len(self.b._parse(self.b.read_dump_file())), 4)
+        self.b._dump('http://127.0.0.1:8008/patroni')
+        self.assertIsNotNone(self.b.read_dump_file(self.b.leader_dump_file))
+        with patch('requests.get', Mock(side_effect=RequestException)):
+            self.b._connect = Mock(side_effect=psycopg2.OperationalError)
+            self.b._dump('http://127.0.0.1:8008/patroni')
+
+    def test_schedule_dump(self):
+        self.b.schedule_dump()
+        self.b._dump_thread.join()
+        self.assertIsNotNone(self.b.read_dump_file())
+        self.b.schedule_dump()
+
+    def test_read_dump_file(self):
+        self.assertIsNone(self.b.read_dump_file())
+        with open(self.b.dump_file, 'wb') as f:
+            f.write(b'foo')
+        self.assertIsNone(self.b.read_dump_file())
+
+    def test_prewarm(self):
+        self.assertFalse(self.b.prewarm())
+        self.b._dump(None)
+        self.assertTrue(self.b.prewarm(True))
+        self.b._prewarm_thread.join()
+        self.assertEquals(self.b.progress['state'], 'finished')
+        self.assertEquals(self.b.progress['blocks_done'], 6)
+
+        self.b._cancel.set()
+        self.b._prewarm(self.b.dump_file, self.b.read_dump_file())
+        self.assertEquals(self.b.progress['state'], 'cancelled')
+
+        self.b._connect = Mock(side_effect=psycopg2.OperationalError)
+        self.b._prewarm(self.b.dump_file, self.b.read_dump_file())
+        self.assertEquals(self.b.progress['state'], 'failed')
+
+    def test_cancel(self):
+        self.b.rate = 1
+        self.b._dump(None)
+        self.b.prewarm()
+        self.b.cancel()
+        self.assertEquals(self.b.progress['state'], 'cancelled')
@@ -0,0 +1,37 @@
+import time
+import unittest
+
+from mock import Mock, patch
+from patroni.callback_executor import CallbackExecutor
+
+
+class TestCallbackExecutor(unittest.TestCase):
+
+    def setUp(self):
+        self.e = CallbackExecutor(timeout=0.2)
+
+    @patch.object(CallbackExecutor, 'start', Mock())
+    def test_call(self):
+        self.e.call(['true', 'on_role_change', 'replica', 'foo'])
+        self.e.call(['true', 'on_start', 'replica', 'foo'])
+        self.e.call(['true', 'on_role_change', 'master', 'foo'])
+        self.assertEquals(self.e._queue, [['true', 'on_start', 'replica', 'foo'],
+                                          ['true', 'on_role_change', 'master', 'foo']])
+        self.assertEquals(self.e.stats, {'queued': 2, 'events': {}})
+
+    def test_execute(self):
+        self.assertEquals(self.e.execute(['false', 'on_start', 'master', 'foo']), 1)
+        self.assertEquals(self.e.stats['events']['on_start']['last_returncode'], 1)
+        self.assertEquals(self.e.execute(['sh', '-c', 'sleep 10 & sleep 10']), -9)
+        self.assertEquals(self.e.stats['events']['-c']['timeouts'], 1)
+        self.assertIsNone(self.e.execute(['/nonexistent', 'on_stop']))
+
+    def test_run(self):
+        with patch.object(CallbackExecutor, 'execute', Mock(side_effect=Exception)):
+            self.e.call(['true', 'on_start', 'replica', 'foo'])
+            while self.e.stats['queued']:
+                time.sleep(0.01)
+        self.e.call(['true', 'on_stop', 'replica', 'foo'])
+        while 'on_stop' not in self.e.stats['events']:
+            time.sleep(0.01)
+        self.assertTrue(self.e.is_alive())
@@ -97,6 +97,8 @@ def etcd_read(key, **kwargs):
                  "modifiedIndex": 1582, "createdIndex": 1582},
                 {"key": "/service/batman5/initialize", "value": "postgresql0",
                  "modifiedIndex": 1582, "createdIndex": 1582},
+                {"key": "/service/batman5/sync", "value": '{"leader":"postgresql1","sync_standby":"postgresql0"}',
+                 "modifiedIndex": 1583, "createdIndex": 1583},
                 {"key": "/service/batman5/leader", "value": "postgresql1",
                  "expiration": "2015-05-15T09:11:00.037397538Z", "ttl": 21,
                  "modifiedIndex": 20728, "createdIndex": 20434},
@@ -212,7 +214,9 @@ class TestEtcd(unittest.TestCase):
                 self.assertRaises(SleepException, self.etcd.get_etcd_client, {'discovery_srv': 'test'})
 
     def test_get_cluster(self):
-        self.assertIsInstance(self.etcd.get_cluster(), Cluster)
+        cluster = self.etcd.get_cluster()
+        self.assertIsInstance(cluster, Cluster)
+        self.assertEquals(cluster.sync.sync_standby, 'postgresql0')
         self.etcd._base_path = '/service/nocluster'
         cluster = self.etcd.get_cluster()
         self.assertIsInstance(cluster, Cluster)
@@ -241,6 +245,12 @@ class TestEtcd(unittest.TestCase):
     def test_update_leader(self):
         self.assertTrue(self.etcd.update_leader())
 
+    def test_write_sync_state(self):
+        self.assertFalse(self.etcd.write_sync_state('foo', 'bar'))
+
+    def test_delete_sync_state(self):
+        self.assertFalse(self.etcd.delete_sync_state())
+
     def test_initialize(self):
         self.assertFalse(self.etcd.initialize())
 
@@ -69,6 +69,23 @@ class TestPatroni(unittest.TestCase):
         self.p.api.start = Mock()
         self.assertRaises(SleepException, self.p.run)
 
+    def test_reload_config(self):
+        self.p.config_file = 'postgres0.yml'
+        self.p.postgresql.reload_config = Mock()
+        self.p.reload_config()
+        self.p.postgresql.reload_config.assert_called_once_with(self.p.postgresql.config)
+        self.p.config_file = 'non-existing.yml'
+        self.p.reload_config()
+
+    @patch('patroni.sighup_received', Mock(return_value=True))
+    @patch('time.sleep', Mock(side_effect=SleepException()))
+    def test_run_reload_config(self):
+        self.p.config_file = 'postgres0.yml'
+        self.p.reload_config = Mock()
+        self.p.ha.dcs.watch = time_sleep
+        self.assertRaises(SleepException, self.p.run)
+        self.p.reload_config.assert_called_once_with()
+
     def test_schedule_next_run(self):
         self.p.ha.dcs.watch = Mock(return_value=True)
         self.p.schedule_next_run()
@@ -0,0 +1,54 @@
+import os
+import shutil
+import time
+import unittest
+
+from mock import Mock, patch
+from patroni.trash import Trash
+
+
+class TestTrash(unittest.TestCase):
+
+    def setUp(self):
+        self.path = 'data/test_trash'
+        os.makedirs(os.path.join(self.path, 'base'))
+        with open(os.path.join(self.path, 'base', '1'), 'wb') as f:
+            f.write(b'1' * 1000)
+        os.symlink('base', os.path.join(self.path, 'link'))
+        os.symlink('1', os.path.join(self.path, 'base', 'link'))
+        self.t = Trash(rate=1000000)
+        self.t.CHUNK = 300
+
+    def tearDown(self):
+        shutil.rmtree('data', ignore_errors=True)
+
+    def wait(self):
+        while self.t.progress is None or self.t.progress['queued']:
+            time.sleep(0.01)
+
+    def test_move(self):
+        self.assertTrue(self.t.move(self.path))
+        self.assertFalse(os.path.exists(self.path))
+        self.wait()
+        self.assertEquals(self.t.progress['state'], 'finished')
+        self.assertEquals(self.t.progress['bytes_removed'], 1000)
+        self.assertEquals(os.listdir('data'), [])
+        self.assertFalse(self.t.move(self.path))
+
+    @patch.object(Trash, 'schedule', Mock())
+    def test_schedule_leftovers(self):
+        self.assertTrue(self.t.move(self.path))
+        self.t.schedule_leftovers(self.path)
+        self.assertEquals(self.t.schedule.call_count, 2)
+        self.t.schedule_leftovers('nonexistent/foo')
+
+    def test_run(self):
+        with patch('os.path.getsize', Mock(side_effect=OSError)):
+            self.t.schedule(self.path)
+            self.wait()
+        self.assertEquals(self.t.progress['state'], 'failed')
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_throttle(self):
+        self.t.rate = 1000
+        self.t._throttle(time.time(), 10)
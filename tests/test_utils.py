@@ -3,6 +3,7 @@ import unittest
 from mock import Mock, patch
 from patroni.exceptions import PatroniException
 from patroni.utils import Retry, RetryFailedError, reap_children, sigchld_handler, sigterm_handler, sleep
+from patroni.utils import sighup_handler, sighup_received
 
 
 def time_sleep(_):
@@ -14,6 +15,11 @@ class TestUtils(unittest.TestCase):
     def test_sigterm_handler(self):
         self.assertRaises(SystemExit, sigterm_handler, None, None)
 
+    def test_sighup_received(self):
+        sighup_handler(None, None)
+        self.assertTrue(sighup_received())
+        self.assertFalse(sighup_received())
+
     @patch('time.sleep', Mock())
     def test_reap_children(self):
         reap_children()
@@ -41,6 +41,8 @@ class MockKazooClient(Mock):
             return (b'foo', ZnodeStat(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0))
         elif path.endswith('/initialize'):
             return (b'foo', ZnodeStat(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0))
+        elif path.endswith('/sync'):
+            return (b'{"leader":"foo","sync_standby":"bar"}', ZnodeStat(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0))
         return (b'', ZnodeStat(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0))
 
     def get_children(self, path, watch=None, include_data=False):
@@ -49,7 +51,7 @@ class MockKazooClient(Mock):
         if path.startswith('/no_node'):
             raise NoNodeError
         elif path in ['/service/bla/', '/service/test/']:
-            return ['initialize', 'leader', 'members', 'optime', 'failover']
+            return ['initialize', 'leader', 'members', 'optime', 'failover', 'sync']
         return ['foo', 'bar', 'buzz']
 
     def create(self, path, value=b"", acl=None, ephemeral=False, sequence=False, makepath=False):
@@ -72,7 +74,7 @@ class MockKazooClient(Mock):
         if path == '/service/test/members/bar':
             if value == b'retry':
                 return
-        if path == '/service/test/failover':
+        if path in ('/service/test/failover', '/service/test/sync'):
             if value == b'Exception':
                 raise Exception
             elif value == b'ok':
@@ -121,6 +123,7 @@ class TestZooKeeper(unittest.TestCase):
     def test__inner_load_cluster(self):
         self.zk._base_path = self.zk._base_path.replace('test', 'bla')
         self.zk._inner_load_cluster()
+        self.assertEquals(self.zk.cluster.sync.sync_standby, 'bar')
         self.zk._base_path = self.zk._base_path = '/no_node'
         self.zk._inner_load_cluster()
 
@@ -137,6 +140,20 @@ class TestZooKeeper(unittest.TestCase):
         self.zk.set_failover_value('ok')
         self.zk.set_failover_value('Exception')
 
+    def test_set_sync_state_value(self):
+        self.assertFalse(self.zk.set_sync_state_value('Exception'))
+        self.assertTrue(self.zk.set_sync_state_value('ok'))
+        self.assertTrue(self.zk.set_sync_state_value('new'))
+        self.assertFalse(self.zk.set_sync_state_value('new', 1))
+
+    def test_delete_sync_state(self):
+        self.assertTrue(self.zk.delete_sync_state())
+        self.zk._base_path = '/service/bla'
+        with patch.object(MockKazooClient, 'delete', Mock(side_effect=NoNodeError)):
+            self.assertTrue(self.zk.delete_sync_state())
+        with patch.object(MockKazooClient, 'delete', Mock(side_effect=Exception)):
+            self.assertFalse(self.zk.delete_sync_state())
+
     def test_initialize(self):
         self.assertFalse(self.zk.initialize())
 